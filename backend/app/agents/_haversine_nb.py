@@ -0,0 +1,32 @@
+"""
+Numba-compiled haversine kernel used by the duplicate scan.
+
+Importing this module requires numba; credibility.haversine_many falls back to
+NumPy when it is unavailable.
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+from app.services.geo import EARTH_RADIUS_M
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def haversine_array(lat1, lon1, lats, lons, out):
+    """Write the distance in meters from (lat1, lon1) to each (lats[i], lons[i]) into out."""
+    phi1 = math.radians(lat1)
+    lam1 = math.radians(lon1)
+    cos_phi1 = math.cos(phi1)
+    for i in prange(lats.shape[0]):
+        phi2 = math.radians(lats[i])
+        dphi = phi2 - phi1
+        dlambda = math.radians(lons[i]) - lam1
+        a = math.sin(dphi / 2) ** 2 + cos_phi1 * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+        out[i] = 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(1.0, a)))
+    return out
+
+
+# Warm up on import so the first request does not pay the compile cost
+haversine_array(0.0, 0.0, np.zeros(1), np.zeros(1), np.empty(1))
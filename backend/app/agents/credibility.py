@@ -1,12 +1,21 @@
 from typing import List, Optional
 from datetime import datetime, timedelta
 import math
+import re
 
+import numpy as np
 from sqlalchemy.orm import Session
 from app.models import Signal, Incident
 from app.config import settings
+from app.services.geo import EARTH_RADIUS_M, M_PER_DEG
 from app.services.opik_logging import log_credibility_decision
 
+try:
+    # Optional JIT kernel; haversine_many falls back to NumPy without numba
+    from app.agents._haversine_nb import haversine_array as _haversine_array_nb
+except Exception:
+    _haversine_array_nb = None
+
 
 DISASTER_KEYWORDS = {
     "fire": ["fire", "smoke", "flames"],
@@ -16,15 +25,13 @@ DISASTER_KEYWORDS = {
     "blackout": ["blackout", "power outage", "no power"],
 }
 
+# All keywords folded into one alternation so a signal's text is scanned once
+_KW_RE = re.compile("|".join(re.escape(k) for kws in DISASTER_KEYWORDS.values() for k in kws), re.IGNORECASE)
+
 
 def simple_credibility_score(text: str, severity: int = 1, corroborations: int = 0) -> float:
     base = 0.2
-    text_lower = text.lower()
-    keyword_bonus = 0.0
-    for _, kws in DISASTER_KEYWORDS.items():
-        if any(k in text_lower for k in kws):
-            keyword_bonus = 0.3
-            break
+    keyword_bonus = 0.3 if _KW_RE.search(text) else 0.0
     severity_bonus = min(0.2, 0.04 * max(1, min(severity, 5)))
     corroboration_bonus = min(0.5, 0.2 * corroborations)
     score = base + keyword_bonus + severity_bonus + corroboration_bonus
@@ -37,32 +44,70 @@ def haversine_m(lat1, lon1, lat2, lon2):
     dphi = math.radians(lat2 - lat1)
     dlambda = math.radians(lon2 - lon1)
     a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    c = 2 * math.asin(math.sqrt(min(1.0, a)))
     return R * c
 
 
-def find_near_duplicates(db: Session, incident: Incident, within_minutes: int = 30, within_meters: float = 200.0) -> List[Incident]:
-    window_start = (incident.start_time or incident.created_at or datetime.utcnow()) - timedelta(minutes=within_minutes)
-    candidates = (
+def haversine_many(lat, lon, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Distances in meters from (lat, lon) to every point of the float64 degree arrays."""
+    if _haversine_array_nb is not None:
+        return _haversine_array_nb(lat, lon, lats, lons, np.empty_like(lats))
+    phi1, lam1 = math.radians(lat), math.radians(lon)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlam = np.radians(lons) - lam1
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def find_near_duplicates(db: Session, incident: Incident, within_minutes: int = 30, within_meters: float = 200.0, now: Optional[datetime] = None) -> List[Incident]:
+    window_start = (incident.start_time or incident.created_at or now or datetime.utcnow()) - timedelta(minutes=within_minutes)
+    # Degree bounding box around the incident so the indexed lat/lon columns drop far-away rows
+    cos_lat0 = math.cos(math.radians(incident.lat))
+    dlat = within_meters / M_PER_DEG
+    dlon = within_meters / (M_PER_DEG * cos_lat0)
+    rows = (
         db.query(Incident)
+        .with_entities(Incident.id, Incident.lat, Incident.lon)
         .filter(Incident.type == incident.type)
         .filter(Incident.created_at >= window_start)
+        .filter(Incident.lat.between(incident.lat - dlat, incident.lat + dlat))
+        .filter(Incident.lon.between(incident.lon - dlon, incident.lon + dlon))
         .all()
     )
-    dupes = []
-    for cand in candidates:
-        dist_m = haversine_m(incident.lat, incident.lon, cand.lat, cand.lon)
-        if dist_m <= within_meters:
-            dupes.append(cand)
+    if not rows:
+        return []
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    lats = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    lons = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+    # Flat-earth screen (accurate at these radii, no trig per row); the small slack keeps
+    # it from ever rejecting a true match, the exact haversine check runs on survivors only
+    dx = (lons - incident.lon) * (M_PER_DEG * cos_lat0)
+    dy = (lats - incident.lat) * M_PER_DEG
+    close = np.flatnonzero(dx * dx + dy * dy <= (within_meters * 1.001) ** 2)
+    if close.size == 0:
+        return []
+    dist_m = haversine_many(incident.lat, incident.lon, lats[close], lons[close])
+    near_ids = ids[close[dist_m <= within_meters]].tolist()
+    if not near_ids:
+        return []
+    dupes = db.query(Incident).filter(Incident.id.in_(near_ids)).all()
+    # Keep candidate order stable (merge_incident treats the first as primary)
+    order = {inc_id: pos for pos, inc_id in enumerate(near_ids)}
+    dupes.sort(key=lambda d: order[d.id])
     return dupes
 
 
-def merge_incident(db: Session, incident: Incident) -> Incident:
-    dupes = find_near_duplicates(db, incident)
+_MERGE_DTYPE = np.dtype([("sev", "i4"), ("cred", "f8"), ("lat", "f8"), ("lon", "f8")])
+
+
+def merge_incident(db: Session, incident: Incident, now: Optional[datetime] = None) -> Incident:
+    # Only flushes; the caller commits so an ingest is a single transaction
+    now = now or datetime.utcnow()
+    dupes = find_near_duplicates(db, incident, now=now)
     if not dupes:
         db.add(incident)
-        db.commit()
-        db.refresh(incident)
+        db.flush()
         try:
             log_credibility_decision(
                 signal={"id": incident.signal_id},
@@ -77,12 +122,19 @@ def merge_incident(db: Session, incident: Incident) -> Incident:
 
     # Merge: pick highest severity/credibility, keep earliest start_time, average location
     all_incidents = [incident] + dupes
-    best_severity = max(i.severity for i in all_incidents)
-    best_cred = max(i.credibility for i in all_incidents)
-    avg_lat = sum(i.lat for i in all_incidents) / len(all_incidents)
-    avg_lon = sum(i.lon for i in all_incidents) / len(all_incidents)
-    start_times = [i.start_time for i in all_incidents if i.start_time]
-    merged_start = min(start_times) if start_times else None
+    arr = np.fromiter(
+        ((i.severity, i.credibility, i.lat, i.lon) for i in all_incidents),
+        dtype=_MERGE_DTYPE,
+        count=len(all_incidents),
+    )
+    best_severity = int(arr["sev"].max())
+    best_cred = float(arr["cred"].max())
+    avg_lat = float(arr["lat"].mean())
+    avg_lon = float(arr["lon"].mean())
+    merged_start = None
+    for i in all_incidents:
+        if i.start_time and (merged_start is None or i.start_time < merged_start):
+            merged_start = i.start_time
 
     # Update the first duplicate and remove the rest
     primary = dupes[0]
@@ -91,8 +143,8 @@ def merge_incident(db: Session, incident: Incident) -> Incident:
     primary.lat = avg_lat
     primary.lon = avg_lon
     primary.start_time = merged_start
-    primary.updated_at = datetime.utcnow()
-    db.commit()
+    primary.updated_at = now
+    db.flush()
     try:
         log_credibility_decision(
             signal={"id": primary.signal_id},
@@ -1,13 +1,17 @@
 from typing import List
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
 
 from app.db import get_db
 from app.models import Signal, Incident
 from app.schemas import SignalCreate, SignalOut, IncidentCreate, IncidentOut, RouteRequest, RouteResponse, RouteLeg
 from app.agents.credibility import simple_credibility_score, merge_incident
-from app.services.routing import choose_safest_route
+from app.services.routing import choose_safest_route, INCIDENT_DTYPE
 from app.services.ingest import run_ingestion, ingest_items, fetch_noaa_nws_alerts, fetch_usgs_quakes, fetch_reddit_incidents, fetch_tavily_news, run_scrape_and_summarize, list_scraped_items, get_scraped_item
 from app.services.ny_incidents import list_ny_incidents_json, list_ny_sources_json
 from app.services.credibility_agent import get_prompts
@@ -20,18 +24,28 @@ from app.events import manager
 router = APIRouter()
 
 
+def _orjson_response(data) -> Response:
+    # Large plain-dict payloads (ny_*) serialize noticeably faster with orjson
+    return Response(content=orjson.dumps(data), media_type="application/json")
+
+
+def get_now() -> datetime:
+    # One timestamp per request, shared by everything the handler touches
+    return datetime.utcnow()
+
+
 @router.get("/health")
 def health():
     return {"status": "ok"}
 
 
 @router.post("/signals", response_model=SignalOut)
-def create_signal(payload: SignalCreate, db: Session = Depends(get_db)):
+def create_signal(payload: SignalCreate, db: Session = Depends(get_db), now: datetime = Depends(get_now)):
     sig = Signal(text=payload.text, source_type=payload.source_type, source_url=payload.source_url)
     db.add(sig)
-    db.commit()
-    db.refresh(sig)
+    db.flush()
 
+    update = None
     # Optional: create incident if lat/lon present (demo convenience)
     if payload.lat is not None and payload.lon is not None:
         credibility = simple_credibility_score(payload.text)
@@ -42,53 +56,62 @@ def create_signal(payload: SignalCreate, db: Session = Depends(get_db)):
             status="verified" if credibility >= 0.5 else "borderline",
             lat=payload.lat,
             lon=payload.lon,
-            start_time=datetime.utcnow(),
+            start_time=now,
             signal_id=sig.id,
         )
-        merged = merge_incident(db, inc)
-        # Broadcast basic update
-        try:
-            import json
-            from app.config import settings
-            msg = json.dumps({
-                "event": "incident_update",
-                "data": {
-                    "id": merged.id,
-                    "type": merged.type,
-                    "severity": merged.severity,
-                    "credibility": merged.credibility,
-                    "lat": merged.lat,
-                    "lon": merged.lon,
-                },
-            })
-            # Fire and forget
-            import asyncio
-            asyncio.create_task(manager.broadcast(msg))
-        except Exception:
-            pass
+        merged = merge_incident(db, inc, now)
+        update = {
+            "event": "incident_update",
+            "data": {
+                "id": merged.id,
+                "type": merged.type,
+                "severity": merged.severity,
+                "credibility": merged.credibility,
+                "lat": merged.lat,
+                "lon": merged.lon,
+            },
+        }
+
+    # Signal, incident and any merge land in one transaction
+    db.commit()
+    db.refresh(sig)
+
+    if update is not None:
+        # Broadcast basic update (batched by the background broadcaster)
+        manager.publish(update)
 
     return sig
 
 
 @router.get("/incidents", response_model=List[IncidentOut])
 def list_incidents(db: Session = Depends(get_db)):
-    return db.query(Incident).order_by(Incident.created_at.desc()).limit(200).all()
+    return (
+        db.query(Incident)
+        .options(load_only(
+            Incident.id, Incident.type, Incident.severity, Incident.credibility, Incident.status,
+            Incident.lat, Incident.lon, Incident.start_time, Incident.end_time,
+            Incident.created_at, Incident.updated_at,
+        ))
+        .order_by(Incident.created_at.desc())
+        .limit(200)
+        .all()
+    )
 
 
 @router.get("/ny_incidents")
-def ny_incidents(db: Session = Depends(get_db)):
+async def ny_incidents(db: Session = Depends(get_db)):
     # Returns aggregated incidents with credibility
-    return list_ny_incidents_json(db)
+    return _orjson_response(await list_ny_incidents_json(db))
 
 
 @router.get("/ny_sources")
 def ny_sources(db: Session = Depends(get_db)):
     # Returns source-level entries (>1000), many pointing to the same incidents
-    return list_ny_sources_json(db)
+    return _orjson_response(list_ny_sources_json(db))
 
 
 @router.post("/incidents/mock", response_model=IncidentOut)
-def create_mock_incident(payload: IncidentCreate, db: Session = Depends(get_db)):
+def create_mock_incident(payload: IncidentCreate, db: Session = Depends(get_db), now: datetime = Depends(get_now)):
     inc = Incident(
         type=payload.type,
         severity=payload.severity,
@@ -96,31 +119,33 @@ def create_mock_incident(payload: IncidentCreate, db: Session = Depends(get_db))
         status="verified",
         lat=payload.lat,
         lon=payload.lon,
-        start_time=payload.start_time or datetime.utcnow(),
+        start_time=payload.start_time or now,
     )
-    merged = merge_incident(db, inc)
+    merged = merge_incident(db, inc, now)
+    db.commit()
+    db.refresh(merged)
     return merged
 
 
 @router.post("/incidents/{incident_id}/approve", response_model=IncidentOut)
-def approve_incident(incident_id: int, db: Session = Depends(get_db)):
+def approve_incident(incident_id: int, db: Session = Depends(get_db), now: datetime = Depends(get_now)):
     inc = db.get(Incident, incident_id)
     if not inc:
         raise HTTPException(status_code=404, detail="Incident not found")
     inc.status = "verified"
-    inc.updated_at = datetime.utcnow()
+    inc.updated_at = now
     db.commit()
     db.refresh(inc)
     return inc
 
 
 @router.post("/incidents/{incident_id}/dismiss", response_model=IncidentOut)
-def dismiss_incident(incident_id: int, db: Session = Depends(get_db)):
+def dismiss_incident(incident_id: int, db: Session = Depends(get_db), now: datetime = Depends(get_now)):
     inc = db.get(Incident, incident_id)
     if not inc:
         raise HTTPException(status_code=404, detail="Incident not found")
     inc.status = "dismissed"
-    inc.updated_at = datetime.utcnow()
+    inc.updated_at = now
     db.commit()
     db.refresh(inc)
     return inc
@@ -129,12 +154,16 @@ def dismiss_incident(incident_id: int, db: Session = Depends(get_db)):
 @router.post("/route", response_model=RouteResponse)
 async def route(req: RouteRequest, db: Session = Depends(get_db)):
     # Gather active incidents (exclude dismissed)
-    incidents = db.query(Incident).filter(Incident.status != "dismissed").all()
-    incidents_view = [
-        {"lat": i.lat, "lon": i.lon, "severity": float(i.severity), "credibility": float(i.credibility)}
-        for i in incidents
-    ]
-    best_index, reason, routes = await choose_safest_route(req.origin, req.destination, incidents_view)
+    rows = db.execute(
+        select(Incident.lat, Incident.lon, Incident.severity, Incident.credibility)
+        .where(Incident.status != "dismissed")
+    ).all()
+    incidents = np.fromiter(
+        ((r.lat, r.lon, r.severity, r.credibility) for r in rows),
+        dtype=INCIDENT_DTYPE,
+        count=len(rows),
+    )
+    best_index, reason, routes = await choose_safest_route(req.origin, req.destination, incidents)
     response_routes = [
         RouteLeg(coordinates=coords, distance_m=dist, duration_s=dur, safety_penalty=pen)
         for coords, dist, dur, pen in [
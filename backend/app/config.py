@@ -27,6 +27,8 @@ class Settings:
     public_agent: bool = os.getenv("PUBLIC_AGENT", "true").lower() == "true"
     # Geocoding base (free)
     nominatim_base: str = os.getenv("NOMINATIM_BASE", "https://nominatim.openstreetmap.org")
+    # Optional Redis for caching upstream responses (NOAA/USGS/OSRM)
+    redis_url: Optional[str] = os.getenv("REDIS_URL")
 
 
 settings = Settings()
\ No newline at end of file
@@ -1,10 +1,20 @@
-from typing import List
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import orjson
 from fastapi import WebSocket
 
 
 class ConnectionManager:
+    # Updates are coalesced: up to BATCH_SIZE messages per broadcast, flushed after BATCH_DELAY_S
+    BATCH_SIZE = 32
+    BATCH_DELAY_S = 0.02
+
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._drain_task: Optional[asyncio.Task] = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -15,14 +25,51 @@ class ConnectionManager:
             self.active_connections.remove(websocket)
 
     async def broadcast(self, message: str):
-        to_remove = []
-        for connection in self.active_connections:
+        connections = list(self.active_connections)
+        results = await asyncio.gather(*(c.send_text(message) for c in connections), return_exceptions=True)
+        for c, res in zip(connections, results):
+            if isinstance(res, Exception):
+                self.disconnect(c)
+
+    def start(self):
+        """Start the background broadcaster; must be called from the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=1024)
+        self._drain_task = self._loop.create_task(self._drain_loop())
+
+    async def stop(self):
+        if self._drain_task:
+            self._drain_task.cancel()
             try:
-                await connection.send_text(message)
-            except Exception:
-                to_remove.append(connection)
-        for c in to_remove:
-            self.disconnect(c)
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+
+    def publish(self, message: Dict[str, Any]):
+        """Queue a message for the next batched broadcast. Safe to call from worker threads."""
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue, message)
+        except RuntimeError:
+            # Event loop already closed (shutdown)
+            pass
+
+    def _enqueue(self, message: Dict[str, Any]):
+        if self.queue.full():
+            # Drop the oldest update rather than block ingest
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def _drain_loop(self):
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(self.BATCH_DELAY_S)
+            while len(batch) < self.BATCH_SIZE and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            if self.active_connections:
+                await self.broadcast(orjson.dumps(batch).decode())
 
 
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager()
@@ -1,13 +1,17 @@
-import json
+import orjson
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 
 from app.db import engine, Base, SessionLocal
+from app.models import Incident
 from app.api.routes import router
 from app.events import manager
 from app.config import settings
 from app.services.ny_incidents import init_ny_incidents
+from app.services.geocoding import close_client as close_geocoding_client
+from app.services.http_clients import close_client as close_http_client
+from app.services.cache import close_redis
 
 
 app = FastAPI(title=settings.app_name)
@@ -24,6 +28,9 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes introduced later to older databases
+    for ix in Incident.__table__.indexes:
+        ix.create(bind=engine, checkfirst=True)
     # Seed NY-only incidents and clear prior scraped data
     try:
         db = SessionLocal()
@@ -34,6 +41,19 @@ def on_startup():
         pass
 
 
+@app.on_event("startup")
+async def start_broadcaster():
+    manager.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await manager.stop()
+    await close_geocoding_client()
+    await close_http_client()
+    await close_redis()
+
+
 app.include_router(router)
 
 
@@ -44,6 +64,6 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             # Echo ping/pong or simple subscription messages
             data = await websocket.receive_text()
-            await websocket.send_text(json.dumps({"event": "ack", "data": data}))
+            await websocket.send_text(orjson.dumps({"event": "ack", "data": data}).decode())
     except Exception:
         manager.disconnect(websocket)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db import Base
 
@@ -25,8 +25,8 @@ class Incident(Base):
     credibility = Column(Float, nullable=False, default=0.0)  # 0-1
     status = Column(String, nullable=False, default="verified")  # verified, borderline, dismissed
 
-    lat = Column(Float, nullable=False)
-    lon = Column(Float, nullable=False)
+    lat = Column(Float, nullable=False, index=True)
+    lon = Column(Float, nullable=False, index=True)
 
     start_time = Column(DateTime, nullable=True)
     end_time = Column(DateTime, nullable=True)
@@ -36,6 +36,11 @@ class Incident(Base):
     signal_id = Column(Integer, ForeignKey("signals.id"), nullable=True)
     signal = relationship("Signal", back_populates="incidents")
 
+    __table_args__ = (
+        # Candidate lookup in find_near_duplicates filters by type + time window
+        Index("ix_incidents_type_created", "type", "created_at"),
+    )
+
 
 class CallSession(Base):
     __tablename__ = "call_sessions"
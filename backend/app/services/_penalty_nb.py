@@ -0,0 +1,43 @@
+"""
+JIT version of routing.safety_penalty_for_route's distance/mask/sum pass.
+
+Only imported when numba is installed.
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+from app.services.geo import M_PER_DEG
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def penalty_kernel(route_lat, route_lon, inc_lat, inc_lon, inc_weight, radius_m, ref_lat):
+    """Sum inc_weight over every (route point, incident) pair within radius_m.
+
+    Coordinates may be offsets from a reference point at latitude ref_lat; distances use the
+    equirectangular approximation with one cosine per route point.
+    """
+    r2 = radius_m * radius_m
+    total = 0.0
+    for i in prange(route_lat.shape[0]):
+        lat = np.float64(route_lat[i])
+        lon = np.float64(route_lon[i])
+        kx = M_PER_DEG * math.cos(math.radians(lat + ref_lat))
+        acc = 0.0
+        for j in range(inc_lat.shape[0]):
+            dy = (np.float64(inc_lat[j]) - lat) * M_PER_DEG
+            dx = (np.float64(inc_lon[j]) - lon) * kx
+            if dx * dx + dy * dy <= r2:
+                acc += inc_weight[j]
+        total += acc
+    return total
+
+
+# Compile eagerly with the dtypes routing passes in
+penalty_kernel(
+    np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.float32),
+    np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.float32),
+    np.zeros(1), 1.0, 0.0,
+)
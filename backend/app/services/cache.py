@@ -0,0 +1,85 @@
+"""
+Redis cache-aside layer for upstream JSON responses (NOAA, USGS, OSRM).
+
+Caching is skipped when redis is not installed or REDIS_URL is unset. Any
+Redis error falls through to the live fetch and pauses Redis use for a short
+cooldown, so an unreachable server costs at most one short timeout per cooldown.
+"""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except Exception:
+    aioredis = None  # type: ignore
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Keep a slow or unreachable Redis from stalling requests that would otherwise fetch live
+_SOCKET_TIMEOUT_S = 0.25
+_ERROR_COOLDOWN_S = 30.0
+
+_REDIS = None
+_REDIS_RETRY_AT = 0.0
+CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "errors": 0}
+
+
+def _get_redis():
+    global _REDIS
+    if time.monotonic() < _REDIS_RETRY_AT:
+        return None
+    if _REDIS is None and aioredis is not None and settings.redis_url:
+        _REDIS = aioredis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=_SOCKET_TIMEOUT_S,
+            socket_timeout=_SOCKET_TIMEOUT_S,
+        )
+    return _REDIS
+
+
+def _redis_failed(op: str, key: str, e: Exception) -> None:
+    global _REDIS_RETRY_AT
+    CACHE_STATS["errors"] += 1
+    _REDIS_RETRY_AT = time.monotonic() + _ERROR_COOLDOWN_S
+    logger.warning("Redis %s failed for %s: %s; bypassing cache for %.0fs", op, key, e, _ERROR_COOLDOWN_S)
+
+
+async def close_redis() -> None:
+    global _REDIS
+    if _REDIS is not None:
+        await _REDIS.aclose()
+        _REDIS = None
+
+
+async def cached_json(key: str, ttl: int, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached value for key, or await fetch() and store its result for ttl seconds.
+
+    Exceptions raised by fetch propagate and nothing is cached.
+    """
+    client = _get_redis()
+    if client is None:
+        return await fetch()
+    try:
+        raw = await client.get(key)
+    except Exception as e:
+        _redis_failed("GET", key, e)
+        return await fetch()
+    if raw is not None:
+        CACHE_STATS["hits"] += 1
+        logger.debug("cache hit %s (%s)", key, CACHE_STATS)
+        return orjson.loads(raw)
+    CACHE_STATS["misses"] += 1
+    logger.debug("cache miss %s (%s)", key, CACHE_STATS)
+    value = await fetch()
+    try:
+        await client.setex(key, ttl, orjson.dumps(value))
+    except Exception as e:
+        _redis_failed("SETEX", key, e)
+    return value
@@ -1,4 +1,9 @@
-from typing import List, Dict, Any
+import threading
+import time
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+import orjson
 
 # Base deterministic scorer remains for fallback and consistency.
 SOURCE_WEIGHTS = {
@@ -21,13 +26,24 @@ SOURCE_WEIGHTS = {
     "Scanner": 0.55,
     "Local Blog": 0.45,
 }
+_WEIGHTS_DEFAULT = SOURCE_WEIGHTS
+
+
+def deterministic_score(sources: List[str]) -> float:
+    """Rule-based 1-5 credibility from the reporting sources' weights and their count; no LLM."""
+    # Order-independent, so identical source multisets share one cache entry
+    return _deterministic_score_cached(tuple(sorted(sources)))
 
 
-def _deterministic_score(sources: List[str]) -> float:
+@lru_cache(maxsize=4096)
+def _deterministic_score_cached(sources: Tuple[str, ...]) -> float:
     if not sources:
         return 1.0
-    weights = [SOURCE_WEIGHTS.get(s, 0.5) for s in sources]
-    avg_weight = sum(weights) / len(weights)
+    weights = _WEIGHTS_DEFAULT
+    total = 0.0
+    for s in sources:
+        total += weights.get(s, 0.5)
+    avg_weight = total / len(sources)
     corroboration = min(len(sources), 25)
     bonus = 0.04 * corroboration  # up to +1.0 at 25 corroborations
     raw = avg_weight + bonus
@@ -75,24 +91,58 @@ def _llm_available() -> bool:
         return False
 
 
-def _call_gemini(prompt: str) -> Dict[str, Any]:
+def _load_gemini_model():
     try:
         from app.config import settings
+        if not settings.gemini_api_key:
+            return None
         import google.generativeai as genai
         genai.configure(api_key=settings.gemini_api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        resp = model.generate_content(prompt)
+        return genai.GenerativeModel("gemini-1.5-flash")
+    except Exception:
+        return None
+
+
+# Configured once per process and reused by every graph invocation
+_GEMINI_MODEL = _load_gemini_model()
+
+
+# Parsed LLM answers keyed by prompt text; experiments repeat identical (version, sources) prompts
+_LLM_CACHE_TTL_S = 600.0
+_LLM_CACHE_MAX = 1024
+_LLM_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_LLM_CACHE_LOCK = threading.Lock()
+
+
+def _call_gemini(prompt: str) -> Dict[str, Any]:
+    now = time.monotonic()
+    with _LLM_CACHE_LOCK:
+        hit = _LLM_CACHE.get(prompt)
+    if hit and hit[0] > now:
+        return dict(hit[1])
+    try:
+        resp = _GEMINI_MODEL.generate_content(prompt)
         text = resp.text or "{}"
-        import json
         # attempt to extract JSON
         start = text.find("{")
         end = text.rfind("}")
-        if start != -1 and end != -1:
-            return json.loads(text[start:end+1])
-        # fallback simple parse
-        return {"score": 3.0, "reason": "LLM returned non-JSON; defaulted"}
+        if start == -1 or end == -1:
+            # fallback simple parse
+            return {"score": 3.0, "reason": "LLM returned non-JSON; defaulted"}
+        out = orjson.loads(text[start:end+1])
     except Exception:
         return {"score": 3.0, "reason": "LLM error; defaulted"}
+    with _LLM_CACHE_LOCK:
+        if len(_LLM_CACHE) >= _LLM_CACHE_MAX:
+            _LLM_CACHE.clear()
+        _LLM_CACHE[prompt] = (now + _LLM_CACHE_TTL_S, out)
+    return dict(out)
+
+
+@lru_cache(maxsize=256)
+def _join_sources(srcs: Tuple[str, ...]) -> str:
+    # Experiments prompt every version with the same source lists
+    return ", ".join(srcs)
 
 
 # Minimal LangGraph pipeline: select prompt → call LLM → parse
@@ -104,6 +154,7 @@ def _build_graph():
         class State(TypedDict):
             sources: List[str]
             version: str
+            prompts: Dict[str, str]
             prompt: str
             llm_output: Dict[str, Any]
             score: float
@@ -113,21 +164,21 @@ def _build_graph():
             srcs = state.get("sources", [])
             ver = state.get("version", "v2")
             # Support injected prompt overrides via state
-            injected = state.get("prompts") or {}
-            catalog = {**PROMPTS, **injected}
+            injected = state.get("prompts")
+            catalog = {**PROMPTS, **injected} if injected else PROMPTS
             base = catalog.get(ver, PROMPTS["v2"])
-            prompt = base + "\nSources: " + ", ".join(srcs)
+            prompt = base + "\nSources: " + _join_sources(tuple(srcs))
             state["prompt"] = prompt
             return state
 
         def run_llm(state: State) -> State:
-            out = _call_gemini(state["prompt"]) if _llm_available() else {"score": _deterministic_score(state["sources"]), "reason": "deterministic fallback"}
+            out = _call_gemini(state["prompt"]) if _llm_available() else {"score": deterministic_score(state["sources"]), "reason": "deterministic fallback"}
             state["llm_output"] = out
             return state
 
         def parse_score(state: State) -> State:
             out = state.get("llm_output", {})
-            score = float(out.get("score", _deterministic_score(state.get("sources", []))))
+            score = float(out.get("score", deterministic_score(state.get("sources", []))))
             reason = str(out.get("reason", "computed"))
             state["score"] = max(1.0, min(5.0, round(score, 2)))
             state["reason"] = reason
@@ -137,6 +188,7 @@ def _build_graph():
         g.add_node("select", select_prompt)
         g.add_node("llm", run_llm)
         g.add_node("parse", parse_score)
+        g.set_entry_point("select")
         g.add_edge("select", "llm")
         g.add_edge("llm", "parse")
         g.add_edge("parse", END)
@@ -149,55 +201,69 @@ _GRAPH_APP = _build_graph()
 
 
 def credibility_score(sources: List[str]) -> float:
-    # Use graph with v2 prompt when available, fallback otherwise
-    if _GRAPH_APP:
+    """LLM-backed 1-5 credibility: one Gemini call (v2 prompt) per invocation when configured.
+
+    Falls back to deterministic_score without an LLM. Listing endpoints use deterministic_score
+    directly so a page load does not fan out into many Gemini calls.
+    """
+    # Skip the graph entirely when no LLM is configured
+    if _llm_available() and _GRAPH_APP:
         try:
             state = {"sources": sources, "version": "v2"}
             result = _GRAPH_APP.invoke(state)
-            return float(result.get("score", _deterministic_score(sources)))
+            return float(result.get("score", deterministic_score(sources)))
         except Exception:
-            return _deterministic_score(sources)
-    return _deterministic_score(sources)
+            return deterministic_score(sources)
+    return deterministic_score(sources)
 
 
-def run_prompt_experiments(real_sources: List[str], fake_sources: List[str]) -> Dict[str, Any]:
-    """Run multiple prompt versions and return scores and reasons for both real vs fake cases."""
-    versions = list(PROMPTS.keys())
-    results: Dict[str, Any] = {"real": {}, "fake": {}}
+def _experiment_states(versions: List[str], real_sources: List[str], fake_sources: List[str], prompts: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    # Two graph inputs per version: real then fake
+    states = []
     for ver in versions:
-        if _GRAPH_APP:
-            try:
-                r1 = _GRAPH_APP.invoke({"sources": real_sources, "version": ver})
-                r2 = _GRAPH_APP.invoke({"sources": fake_sources, "version": ver})
-                results["real"][ver] = {"score": r1.get("score", 3.0), "reason": r1.get("reason", "")}
-                results["fake"][ver] = {"score": r2.get("score", 3.0), "reason": r2.get("reason", "")}
-                continue
-            except Exception:
-                pass
+        for srcs in (real_sources, fake_sources):
+            state: Dict[str, Any] = {"sources": srcs, "version": ver}
+            if prompts is not None:
+                state["prompts"] = prompts
+            states.append(state)
+    return states
+
+
+def _collect_experiment_results(versions: List[str], real_sources: List[str], fake_sources: List[str], outputs: List[Any]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"real": {}, "fake": {}}
+    for i, ver in enumerate(versions):
+        r1, r2 = outputs[2 * i], outputs[2 * i + 1]
+        if isinstance(r1, dict) and isinstance(r2, dict):
+            results["real"][ver] = {"score": r1.get("score", 3.0), "reason": r1.get("reason", "")}
+            results["fake"][ver] = {"score": r2.get("score", 3.0), "reason": r2.get("reason", "")}
+            continue
         # Fallback deterministic
-        results["real"][ver] = {"score": _deterministic_score(real_sources), "reason": "deterministic"}
-        results["fake"][ver] = {"score": _deterministic_score(fake_sources), "reason": "deterministic"}
+        results["real"][ver] = {"score": deterministic_score(real_sources), "reason": "deterministic"}
+        results["fake"][ver] = {"score": deterministic_score(fake_sources), "reason": "deterministic"}
     return results
 
 
+def _run_experiments(versions: List[str], real_sources: List[str], fake_sources: List[str], prompts: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    states = _experiment_states(versions, real_sources, fake_sources, prompts)
+    outputs: List[Any] = [None] * len(states)
+    if _llm_available() and _GRAPH_APP:
+        try:
+            # Graph runs are independent LLM calls; batch() fans them out concurrently
+            outputs = _GRAPH_APP.batch(states, return_exceptions=True)
+        except Exception:
+            pass
+    return _collect_experiment_results(versions, real_sources, fake_sources, outputs)
+
+
+def run_prompt_experiments(real_sources: List[str], fake_sources: List[str]) -> Dict[str, Any]:
+    """Run multiple prompt versions and return scores and reasons for both real vs fake cases."""
+    return _run_experiments(list(PROMPTS.keys()), real_sources, fake_sources)
+
+
 def run_prompt_experiments_custom(prompts: Dict[str, str], real_sources: List[str], fake_sources: List[str]) -> Dict[str, Any]:
     """Run experiments using custom prompt texts provided at runtime."""
     versions = list(prompts.keys()) or list(PROMPTS.keys())
-    results: Dict[str, Any] = {"real": {}, "fake": {}}
-    for ver in versions:
-        if _GRAPH_APP:
-            try:
-                r1 = _GRAPH_APP.invoke({"sources": real_sources, "version": ver, "prompts": prompts})
-                r2 = _GRAPH_APP.invoke({"sources": fake_sources, "version": ver, "prompts": prompts})
-                results["real"][ver] = {"score": r1.get("score", 3.0), "reason": r1.get("reason", "")}
-                results["fake"][ver] = {"score": r2.get("score", 3.0), "reason": r2.get("reason", "")}
-                continue
-            except Exception:
-                pass
-        # Fallback deterministic
-        results["real"][ver] = {"score": _deterministic_score(real_sources), "reason": "deterministic"}
-        results["fake"][ver] = {"score": _deterministic_score(fake_sources), "reason": "deterministic"}
-    return results
+    return _run_experiments(versions, real_sources, fake_sources, prompts)
 
 
 def get_prompts() -> Dict[str, str]:
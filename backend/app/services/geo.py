@@ -0,0 +1,9 @@
+"""
+Spherical-earth constants shared by the distance calculations.
+"""
+
+import math
+
+EARTH_RADIUS_M = 6371_000.0
+# Meters per degree of latitude on that sphere
+M_PER_DEG = math.radians(EARTH_RADIUS_M)
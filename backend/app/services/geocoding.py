@@ -1,20 +1,50 @@
+from collections import OrderedDict
 from typing import Optional, Tuple
 import httpx
+import orjson
+
+from app.config import settings
+
+
+_NOMINATIM_CLIENT: Optional[httpx.AsyncClient] = None
+# Nominatim answers are stable, so keep recent lookups in memory (LRU)
+_CACHE_SIZE = 1024
+_GEOCODE_CACHE: "OrderedDict[str, Optional[Tuple[float, float]]]" = OrderedDict()
+
+
+async def _get_client() -> httpx.AsyncClient:
+    global _NOMINATIM_CLIENT
+    if _NOMINATIM_CLIENT is None or _NOMINATIM_CLIENT.is_closed:
+        _NOMINATIM_CLIENT = httpx.AsyncClient(
+            base_url=settings.nominatim_base,
+            timeout=10,
+            headers={"User-Agent": "DisasterSafetyDemo/1.0"},
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        )
+    return _NOMINATIM_CLIENT
+
+
+async def close_client() -> None:
+    global _NOMINATIM_CLIENT
+    if _NOMINATIM_CLIENT is not None:
+        await _NOMINATIM_CLIENT.aclose()
+        _NOMINATIM_CLIENT = None
 
 
 async def geocode_query(query: str) -> Optional[Tuple[float, float]]:
-    url = "https://nominatim.openstreetmap.org/search"
+    if query in _GEOCODE_CACHE:
+        _GEOCODE_CACHE.move_to_end(query)
+        return _GEOCODE_CACHE[query]
     params = {"format": "json", "q": query, "limit": 1}
-    headers = {"User-Agent": "DisasterSafetyDemo/1.0"}
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(url, params=params, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
-            if data:
-                lat = float(data[0]["lat"])
-                lon = float(data[0]["lon"])
-                return (lat, lon)
-            return None
+        client = await _get_client()
+        resp = await client.get("/search", params=params)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        result = (float(data[0]["lat"]), float(data[0]["lon"])) if data else None
     except Exception:
-        return None
\ No newline at end of file
+        return None
+    _GEOCODE_CACHE[query] = result
+    if len(_GEOCODE_CACHE) > _CACHE_SIZE:
+        _GEOCODE_CACHE.popitem(last=False)
+    return result
@@ -0,0 +1,70 @@
+"""
+Shared outbound HTTP client for ingestion and routing calls (NOAA, USGS, OSRM).
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+import httpx
+
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        # Pool settings live on the transport; retries re-attempt failed connects
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            http2=_HTTP2,
+            retries=3,
+        )
+        _CLIENT = httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(30.0))
+    return _CLIENT
+
+
+async def close_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+def _retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+async def with_retries(
+    fetch: Callable[..., Awaitable[T]],
+    *args: Any,
+    attempts: int = 3,
+    base_delay: float = 0.2,
+    max_delay: float = 2.0,
+) -> T:
+    """Await fetch(*args), retrying transport errors, 429 and 5xx with jittered exponential backoff."""
+    for attempt in range(attempts):
+        try:
+            return await fetch(*args)
+        except Exception as e:
+            if attempt == attempts - 1 or not _retryable(e):
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt) + random.uniform(0, base_delay)
+            logger.warning("Upstream request failed (%r), retry %d in %.2fs", e, attempt + 1, delay)
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
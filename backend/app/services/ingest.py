@@ -4,11 +4,55 @@ Data ingestion from multiple sources: NOAA, USGS, Reddit, Tavily.
 
 import os
 import asyncio
-from typing import List, Dict, Any, Optional
+import logging
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime
-import httpx
+import orjson
 from tavily import TavilyClient
 
+from app.services.cache import cached_json
+from app.services.http_clients import get_client, with_retries
+
+try:
+    import ijson
+except Exception:
+    ijson = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+class _AsyncByteReader:
+    """Async file-like view of a streamed httpx response, as ijson expects."""
+
+    def __init__(self, response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, n: int = -1) -> bytes:
+        if n == 0:
+            # ijson probes with read(0) to detect bytes vs str
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+async def _iter_geojson_features(url: str) -> AsyncIterator[Dict[str, Any]]:
+    """Yield GeoJSON features one at a time while the body is still downloading.
+
+    Falls back to parsing the whole document when ijson is not installed.
+    """
+    async with get_client().stream("GET", url) as response:
+        response.raise_for_status()
+        if ijson is None:
+            data = orjson.loads(await response.aread())
+            for feature in data.get("features", []):
+                yield feature
+            return
+        async for feature in ijson.items(_AsyncByteReader(response), "features.item", use_float=True):
+            yield feature
+
 
 class DataIngestion:
     """Handles data ingestion from multiple emergency/disaster sources."""
@@ -17,6 +61,8 @@ class DataIngestion:
         self.tavily_client = None
         if os.getenv("TAVILY_API_KEY"):
             self.tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+        # In-flight aggregations keyed by (location, sources); concurrent callers share one fan-out
+        self._inflight: Dict[Tuple[str, Tuple[str, ...]], asyncio.Task] = {}
     
     async def search_tavily_incidents(
         self,
@@ -43,13 +89,14 @@ class DataIngestion:
             )
             
             incidents = []
+            now_iso = datetime.utcnow().isoformat()
             for result in results.get("results", []):
                 incident = {
                     "title": result.get("title", ""),
                     "description": result.get("content", ""),
                     "source": result.get("url", ""),
                     "source_type": "tavily",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": now_iso,
                     "raw_score": result.get("score", 0.0)
                 }
                 incidents.append(incident)
@@ -62,34 +109,35 @@ class DataIngestion:
     async def fetch_noaa_alerts(self, state: str = "NY") -> List[Dict[str, Any]]:
         """Fetch weather alerts from NOAA API."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                url = f"https://api.weather.gov/alerts/active?area={state}"
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                data = response.json()
-                alerts = []
-                
-                for feature in data.get("features", []):
-                    properties = feature.get("properties", {})
-                    alert = {
-                        "title": properties.get("headline", "Weather Alert"),
-                        "description": properties.get("description", ""),
-                        "event_type": properties.get("event", ""),
-                        "severity": properties.get("severity", ""),
-                        "urgency": properties.get("urgency", ""),
-                        "source": "NOAA",
-                        "source_type": "noaa",
-                        "timestamp": properties.get("onset", datetime.utcnow().isoformat()),
-                        "areas": properties.get("areaDesc", "")
-                    }
-                    alerts.append(alert)
-                
-                return alerts
+            return await cached_json(
+                f"noaa:{state}", 60, lambda: with_retries(self._fetch_noaa_alerts, state)
+            )
         except Exception as e:
-            print(f"NOAA fetch error: {e}")
+            logger.warning("NOAA fetch error: %s", e)
             return []
     
+    async def _fetch_noaa_alerts(self, state: str) -> List[Dict[str, Any]]:
+        url = f"https://api.weather.gov/alerts/active?area={state}"
+        alerts = []
+        now_iso = datetime.utcnow().isoformat()
+        
+        async for feature in _iter_geojson_features(url):
+            properties = feature.get("properties", {})
+            alert = {
+                "title": properties.get("headline", "Weather Alert"),
+                "description": properties.get("description", ""),
+                "event_type": properties.get("event", ""),
+                "severity": properties.get("severity", ""),
+                "urgency": properties.get("urgency", ""),
+                "source": "NOAA",
+                "source_type": "noaa",
+                "timestamp": properties.get("onset") or now_iso,
+                "areas": properties.get("areaDesc", "")
+            }
+            alerts.append(alert)
+        
+        return alerts
+    
     async def fetch_usgs_earthquakes(
         self,
         min_magnitude: float = 2.5,
@@ -97,41 +145,41 @@ class DataIngestion:
     ) -> List[Dict[str, Any]]:
         """Fetch earthquake data from USGS."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                url = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/all_week.geojson"
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                data = response.json()
-                earthquakes = []
-                
-                for feature in data.get("features", []):
-                    properties = feature.get("properties", {})
-                    geometry = feature.get("geometry", {})
-                    
-                    magnitude = properties.get("mag", 0.0)
-                    if magnitude >= min_magnitude:
-                        quake = {
-                            "title": properties.get("title", "Earthquake"),
-                            "description": f"Magnitude {magnitude} earthquake",
-                            "magnitude": magnitude,
-                            "place": properties.get("place", ""),
-                            "latitude": geometry.get("coordinates", [None, None])[1],
-                            "longitude": geometry.get("coordinates", [None, None])[0],
-                            "depth": geometry.get("coordinates", [None, None, None])[2],
-                            "source": "USGS",
-                            "source_type": "usgs",
-                            "timestamp": datetime.fromtimestamp(
-                                properties.get("time", 0) / 1000
-                            ).isoformat()
-                        }
-                        earthquakes.append(quake)
-                
-                return earthquakes
+            return await cached_json(
+                f"usgs:{min_magnitude}", 300, lambda: with_retries(self._fetch_usgs_earthquakes, min_magnitude)
+            )
         except Exception as e:
-            print(f"USGS fetch error: {e}")
+            logger.warning("USGS fetch error: %s", e)
             return []
     
+    async def _fetch_usgs_earthquakes(self, min_magnitude: float) -> List[Dict[str, Any]]:
+        url = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/all_week.geojson"
+        earthquakes = []
+        
+        async for feature in _iter_geojson_features(url):
+            properties = feature.get("properties", {})
+            geometry = feature.get("geometry", {})
+            
+            magnitude = properties.get("mag", 0.0)
+            if magnitude >= min_magnitude:
+                quake = {
+                    "title": properties.get("title", "Earthquake"),
+                    "description": f"Magnitude {magnitude} earthquake",
+                    "magnitude": magnitude,
+                    "place": properties.get("place", ""),
+                    "latitude": geometry.get("coordinates", [None, None])[1],
+                    "longitude": geometry.get("coordinates", [None, None])[0],
+                    "depth": geometry.get("coordinates", [None, None, None])[2],
+                    "source": "USGS",
+                    "source_type": "usgs",
+                    "timestamp": datetime.fromtimestamp(
+                        properties.get("time", 0) / 1000
+                    ).isoformat()
+                }
+                earthquakes.append(quake)
+        
+        return earthquakes
+    
     async def search_reddit_incidents(
         self,
         subreddit: str = "nyc",
@@ -151,6 +199,23 @@ class DataIngestion:
         if sources is None:
             sources = ["tavily", "noaa", "usgs"]
         
+        key = (location, tuple(sorted(sources)))
+        task = self._inflight.get(key)
+        if task is None:
+            # The work runs as its own task, so cancelling any one caller (the first included)
+            # leaves it running for the others
+            task = asyncio.ensure_future(self._aggregate_incidents(location, sources))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._forget_inflight(key, t))
+        return list(await asyncio.shield(task))
+    
+    def _forget_inflight(self, key: Tuple[str, Tuple[str, ...]], task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark a failure as retrieved in case every caller was cancelled before it landed
+            task.exception()
+    
+    async def _aggregate_incidents(self, location: str, sources: List[str]) -> List[Dict[str, Any]]:
         all_incidents = []
         tasks = []
         
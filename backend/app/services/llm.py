@@ -1,14 +1,42 @@
-from typing import List, Dict
+import re
+from typing import Any, List, Dict, Optional
+
+import orjson
+
+try:
+    import google.generativeai as genai
+except Exception:
+    genai = None  # type: ignore
+
+from app.config import settings
+
+
+# Fallback for replies that wrap the JSON object in extra text
+_JSON_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+
+# genai.configure is process-global, so only the app's own key gets a cached model
+_MODEL: Optional[Any] = None
+
+
+def _get_model(api_key: str):
+    global _MODEL
+    if api_key != settings.gemini_api_key:
+        # Some other key: configure for this call only, as before, and make the
+        # next call with the app's key reconfigure rather than reuse a stale model
+        _MODEL = None
+        genai.configure(api_key=api_key)
+        return genai.GenerativeModel("gemini-1.5-flash")
+    if _MODEL is None:
+        genai.configure(api_key=api_key)
+        _MODEL = genai.GenerativeModel("gemini-1.5-flash")
+    return _MODEL
 
 
 def summarize_with_gemini(messages: List[Dict[str, str]], api_key: str) -> str:
-    try:
-        import google.generativeai as genai
-    except Exception:
+    if genai is None:
         return "Gemini client unavailable."
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = _get_model(api_key)
         content = []
         for m in messages:
             content.append({"role": m.get("role", "user"), "parts": [m.get("text", "")]})
@@ -27,9 +55,7 @@ def summarize_with_gemini(messages: List[Dict[str, str]], api_key: str) -> str:
 
 
 def categorize_incident_with_gemini(text: str, api_key: str) -> Dict[str, str]:
-    try:
-        import google.generativeai as genai
-    except Exception:
+    if genai is None:
         return {
             "summary": "Gemini client unavailable.",
             "where": "",
@@ -38,29 +64,40 @@ def categorize_incident_with_gemini(text: str, api_key: str) -> Dict[str, str]:
             "note": "",
         }
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = _get_model(api_key)
         instruction = (
             "Extract four fields from the incident text: WHERE, WHEN, INJURED_COUNT (number), and NOTE."
             " Return a short 1-2 sentence SUMMARY first."
             " Format strictly as JSON with keys: summary, where, when, injured_count, note."
             " If information missing, leave the field blank or use 'unknown'."
         )
-        response = model.generate_content([
-            {"role": "system", "parts": [instruction]},
-            {"role": "user", "parts": [text]},
-        ])
-        output_text = getattr(response, "text", None) or (
-            response.candidates[0].content.parts[0].text if response.candidates else ""
+        response = model.generate_content(
+            [
+                {"role": "system", "parts": [instruction]},
+                {"role": "user", "parts": [text]},
+            ],
+            generation_config={"response_mime_type": "application/json"},
+            stream=True,
         )
-        import json
-        try:
-            data = json.loads(output_text)
-        except Exception:
-            # try to coerce by finding JSON in text
-            import re
-            m = re.search(r"\{[\s\S]*\}", output_text)
-            data = json.loads(m.group(0)) if m else {}
+        # Parse as chunks arrive and stop at the first complete JSON object
+        data = None
+        output_text = ""
+        for chunk in response:
+            output_text += getattr(chunk, "text", "") or ""
+            opened = output_text.count("{")
+            if opened and opened == output_text.count("}"):
+                try:
+                    data = orjson.loads(output_text)
+                    break
+                except Exception:
+                    pass
+        if data is None:
+            try:
+                data = orjson.loads(output_text)
+            except Exception:
+                # try to coerce by finding JSON in text
+                m = _JSON_OBJ_RE.search(output_text)
+                data = orjson.loads(m.group(0)) if m else {}
         return {
             "summary": data.get("summary", ""),
             "where": data.get("where", ""),
@@ -1,11 +1,14 @@
-from typing import List, Dict
+import asyncio
+from collections import defaultdict
+from typing import List, Dict, Tuple
 from datetime import datetime, timedelta
-import random
 
+import numpy as np
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models import ScrapedItem, NYIncident, NYSource
-from app.services.credibility_agent import credibility_score
+from app.services.credibility_agent import deterministic_score
 
 
 def clear_scraped_items(db: Session) -> None:
@@ -24,85 +27,97 @@ def clear_ny_incidents(db: Session) -> None:
         db.rollback()
 
 
-def _nyc_spots() -> List[Dict]:
-    # Representative points distributed across NYC boroughs
-    return [
-        {"name": "Manhattan - Times Square", "lat": 40.7580, "lon": -73.9855},
-        {"name": "Manhattan - Central Park", "lat": 40.7829, "lon": -73.9654},
-        {"name": "Brooklyn - Downtown", "lat": 40.6939, "lon": -73.9850},
-        {"name": "Brooklyn - Williamsburg", "lat": 40.7081, "lon": -73.9571},
-        {"name": "Queens - Flushing", "lat": 40.7675, "lon": -73.8331},
-        {"name": "Queens - Long Island City", "lat": 40.7440, "lon": -73.9489},
-        {"name": "Bronx - Fordham", "lat": 40.8590, "lon": -73.8929},
-        {"name": "Bronx - Highbridge", "lat": 40.8360, "lon": -73.9220},
-        {"name": "Staten Island - St. George", "lat": 40.6441, "lon": -74.0721},
-        {"name": "Staten Island - New Dorp", "lat": 40.5715, "lon": -74.1174},
-        {"name": "Manhattan - Financial District", "lat": 40.7075, "lon": -74.0113},
-        {"name": "Brooklyn - Sunset Park", "lat": 40.6453, "lon": -74.0129},
-        {"name": "Queens - Astoria", "lat": 40.7645, "lon": -73.9235},
-        {"name": "Bronx - Mott Haven", "lat": 40.8090, "lon": -73.9229},
-        {"name": "Manhattan - Harlem", "lat": 40.8116, "lon": -73.9465},
-    ]
-
-
-def _mock_types() -> List[str]:
-    return [
-        "fire breakout",
-        "shooting",
-        "road blocker",
-        "accident",
-        "assault",
-        "explosion",
-    ]
+# Representative points distributed across NYC boroughs
+_NYC_SPOTS_NAME = (
+    "Manhattan - Times Square",
+    "Manhattan - Central Park",
+    "Brooklyn - Downtown",
+    "Brooklyn - Williamsburg",
+    "Queens - Flushing",
+    "Queens - Long Island City",
+    "Bronx - Fordham",
+    "Bronx - Highbridge",
+    "Staten Island - St. George",
+    "Staten Island - New Dorp",
+    "Manhattan - Financial District",
+    "Brooklyn - Sunset Park",
+    "Queens - Astoria",
+    "Bronx - Mott Haven",
+    "Manhattan - Harlem",
+)
+_NYC_SPOTS_LAT = np.array([
+    40.7580, 40.7829, 40.6939, 40.7081, 40.7675,
+    40.7440, 40.8590, 40.8360, 40.6441, 40.5715,
+    40.7075, 40.6453, 40.7645, 40.8090, 40.8116,
+], dtype=np.float64)
+_NYC_SPOTS_LON = np.array([
+    -73.9855, -73.9654, -73.9850, -73.9571, -73.8331,
+    -73.9489, -73.8929, -73.9220, -74.0721, -74.1174,
+    -74.0113, -74.0129, -73.9235, -73.9229, -73.9465,
+], dtype=np.float64)
+
+_MOCK_TYPES = (
+    "fire breakout",
+    "shooting",
+    "road blocker",
+    "accident",
+    "assault",
+    "explosion",
+)
 
 
 def generate_mock_ny_incidents(count: int = 150) -> List[Dict]:
-    spots = _nyc_spots()
-    kinds = _mock_types()
+    sources_pool = [
+        "NYPD", "FDNY", "NYC DOT", "NYC OEM",
+        "CBS New York", "NBC New York", "ABC7NY",
+        "Gothamist", "NY1", "NYPost", "Daily News",
+        "CitizenApp", "Scanner", "Local Blog",
+    ]
     incidents: List[Dict] = []
     now = datetime.utcnow()
-    for i in range(count):
-        spot = spots[i % len(spots)]
-        kind = kinds[i % len(kinds)]
-        # Jitter around the spot for broader distribution across NYC
-        lat = spot["lat"] + random.uniform(-0.01, 0.01)
-        lon = spot["lon"] + random.uniform(-0.01, 0.01)
-        # Time spread over last 72 hours
-        minutes_ago = random.randint(10, 72 * 60)
-        t = now - timedelta(minutes=minutes_ago)
-        summary = f"{kind.title()} near {spot['name']} reported by local sources."
+    # Draw all randomness up front: jitter around the spot for broader distribution
+    # across NYC, time spread over the last 72 hours, and the reporting source
+    rng = np.random.default_rng()
+    jitter = rng.uniform(-0.01, 0.01, size=(count, 2))
+    minutes_ago = rng.integers(10, 72 * 60, size=count, endpoint=True).tolist()
+    src_idx = rng.integers(0, len(sources_pool), size=count).tolist()
+    # Spots cycle in order; look up coordinates for all incidents at once
+    spot_idx = np.arange(count) % len(_NYC_SPOTS_NAME)
+    lats = np.round(_NYC_SPOTS_LAT[spot_idx] + jitter[:, 0], 6).tolist()
+    lons = np.round(_NYC_SPOTS_LON[spot_idx] + jitter[:, 1], 6).tolist()
+    for i, j in enumerate(spot_idx.tolist()):
+        kind = _MOCK_TYPES[i % len(_MOCK_TYPES)]
+        t = now - timedelta(minutes=minutes_ago[i])
+        summary = f"{kind.title()} near {_NYC_SPOTS_NAME[j]} reported by local sources."
         incidents.append({
-            "lat": round(lat, 6),
-            "lon": round(lon, 6),
+            "lat": lats[i],
+            "lon": lons[i],
             "time": t,
             "summary": summary,
-            "source": random.choice([
-                "NYPD", "FDNY", "NYC DOT", "NYC OEM",
-                "CBS New York", "NBC New York", "ABC7NY",
-                "Gothamist", "NY1", "NYPost", "Daily News",
-                "CitizenApp", "Scanner", "Local Blog",
-            ]),
+            "source": sources_pool[src_idx[i]],
         })
     return incidents
 
 
 def save_ny_incidents(db: Session, incidents: List[Dict]) -> int:
-    saved = 0
-    for it in incidents:
-        row = NYIncident(
-            lat=float(it["lat"]),
-            lon=float(it["lon"]),
-            time=it["time"],
-            summary=it.get("summary", "NY incident"),
-            source=it.get("source"),
-        )
-        db.add(row)
-        saved += 1
+    rows = [
+        {
+            "lat": float(it["lat"]),
+            "lon": float(it["lon"]),
+            "time": it["time"],
+            "summary": it.get("summary", "NY incident"),
+            "source": it.get("source"),
+        }
+        for it in incidents
+    ]
+    # Single multi-row INSERT instead of per-row ORM unit-of-work
+    if rows:
+        db.execute(insert(NYIncident), rows)
     db.commit()
-    return saved
+    return len(rows)
 
 
-def generate_source_entries(base: List[Dict], min_per_incident: int = 15, max_per_incident: int = 25) -> List[Dict]:
+def generate_source_entries(base_rows: List[NYIncident], min_per_incident: int = 15, max_per_incident: int = 25) -> List[Dict]:
     sources_pool = [
         # Official and agencies
         "NYPD", "FDNY", "NYC DOT", "NYC OEM", "MTA", "NYC Mayor's Office",
@@ -114,44 +129,42 @@ def generate_source_entries(base: List[Dict], min_per_incident: int = 15, max_pe
         # Community / apps
         "NYPost", "Daily News", "CitizenApp", "Scanner", "Local Blog",
     ]
+    rng = np.random.default_rng()
+    n_per = rng.integers(min_per_incident, max_per_incident, size=len(base_rows), endpoint=True).tolist()
+    picks = rng.integers(0, len(sources_pool), size=sum(n_per)).tolist()
     entries: List[Dict] = []
-    for it in base:
-        n = random.randint(min_per_incident, max_per_incident)
-        for _ in range(n):
-            s = random.choice(sources_pool)
+    pos = 0
+    for r, n in zip(base_rows, n_per):
+        for k in picks[pos:pos + n]:
+            s = sources_pool[k]
             entries.append({
-                "lat": it["lat"],
-                "lon": it["lon"],
-                "time": it["time"],
-                "summary": it["summary"],
+                "incident_id": r.id,
+                "lat": r.lat,
+                "lon": r.lon,
+                "time": r.time,
+                "summary": r.summary,
                 "source": s,
             })
+        pos += n
     return entries
 
 
-def save_ny_sources(db: Session, base_rows: List[NYIncident], entries: List[Dict]) -> int:
-    saved = 0
-    # Build quick index by lat/lon/time match to incident_id
-    # Since we created base rows, map by rounded lat/lon and time equality
-    idx = {}
-    for r in base_rows:
-        key = (round(r.lat, 6), round(r.lon, 6), r.time.replace(microsecond=0))
-        idx[key] = r.id
-    for e in entries:
-        key = (round(e["lat"], 6), round(e["lon"], 6), e["time"].replace(microsecond=0))
-        incident_id = idx.get(key)
-        row = NYSource(
-            incident_id=incident_id,
-            lat=float(e["lat"]),
-            lon=float(e["lon"]),
-            time=e["time"],
-            summary=e.get("summary", "NY incident"),
-            source=e.get("source"),
-        )
-        db.add(row)
-        saved += 1
+def save_ny_sources(db: Session, entries: List[Dict]) -> int:
+    rows = [
+        {
+            "incident_id": e.get("incident_id"),
+            "lat": float(e["lat"]),
+            "lon": float(e["lon"]),
+            "time": e["time"],
+            "summary": e.get("summary", "NY incident"),
+            "source": e.get("source"),
+        }
+        for e in entries
+    ]
+    if rows:
+        db.execute(insert(NYSource), rows)
     db.commit()
-    return saved
+    return len(entries)
 
 
 def init_ny_incidents(db: Session) -> Dict:
@@ -165,11 +178,8 @@ def init_ny_incidents(db: Session) -> Dict:
     # Fetch saved base rows
     base_rows = db.query(NYIncident).order_by(NYIncident.time.desc()).limit(500).all()
     # Generate rich source entries (3000+)
-    entries = generate_source_entries([
-        {"lat": r.lat, "lon": r.lon, "time": r.time, "summary": r.summary}
-        for r in base_rows
-    ], min_per_incident=15, max_per_incident=25)
-    saved_sources = save_ny_sources(db, base_rows, entries)
+    entries = generate_source_entries(base_rows, min_per_incident=15, max_per_incident=25)
+    saved_sources = save_ny_sources(db, entries)
     return {"saved_incidents": saved, "saved_sources": saved_sources}
 
 
@@ -186,18 +196,35 @@ def list_ny_sources_json(db: Session) -> List[Dict]:
     ]
 
 
-def list_ny_incidents_json(db: Session) -> List[Dict]:
-    # Aggregate credibility by incident using linked sources
+def _load_incident_sources(db: Session) -> Tuple[List[NYIncident], Dict[int, List[str]]]:
     incidents = db.query(NYIncident).order_by(NYIncident.time.desc()).limit(500).all()
+    # One IN query for all linked sources instead of one query per incident
+    by_inc: Dict[int, List[str]] = defaultdict(list)
+    if incidents:
+        rows = (
+            db.query(NYSource.incident_id, NYSource.source)
+            .filter(NYSource.incident_id.in_([i.id for i in incidents]))
+            .order_by(NYSource.id)
+            .all()
+        )
+        for incident_id, source in rows:
+            names = by_inc[incident_id]
+            if len(names) < 100:
+                names.append(source or "Local Blog")
+    return incidents, by_inc
+
+
+async def list_ny_incidents_json(db: Session) -> List[Dict]:
+    # Aggregate credibility by incident using linked sources.
+    # The blocking DB reads run in a worker thread so the event loop stays free.
+    incidents, by_inc = await asyncio.to_thread(_load_incident_sources, db)
     out: List[Dict] = []
     for inc in incidents:
-        sources = db.query(NYSource).filter(NYSource.incident_id == inc.id).limit(100).all()
-        src_names = [s.source or "Local Blog" for s in sources]
-        cred = credibility_score(src_names)
         out.append({
             "Where": {"lat": inc.lat, "long": inc.lon},
             "Time": inc.time.isoformat() + "Z",
             "Summary": inc.summary,
-            "Credibility": cred,
+            # Memoized across requests by the scorer's own lru_cache on the sorted source tuple
+            "Credibility": deterministic_score(by_inc.get(inc.id, [])),
         })
-    return out
\ No newline at end of file
+    return out
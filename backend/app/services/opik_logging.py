@@ -1,4 +1,9 @@
-from typing import Optional, Dict, Any, List, Tuple
+import queue
+import threading
+import time
+from typing import Callable, Optional, Dict, Any, List, Tuple, Union
+
+import numpy as np
 
 try:
     from opik import Opik
@@ -8,75 +13,161 @@ except Exception:
 from app.config import settings
 
 
+# Traces are queued and sent by a background thread so request handlers never wait on Opik
+_QUEUE_MAXSIZE = 1024
+_BATCH_SIZE = 32
+_BATCH_WAIT_S = 0.5
+
+# (trace name, input, metadata, output); metadata may be a builder that the worker calls,
+# so expensive payloads are only materialized for traces that are actually sent
+_Metadata = Union[Dict[str, Any], Callable[[], Dict[str, Any]], None]
+_TraceItem = Tuple[str, Optional[Dict[str, Any]], _Metadata, Dict[str, Any]]
+
+_QUEUE: "queue.Queue[_TraceItem]" = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+_LOCK = threading.Lock()
+_CLIENT: Optional["Opik"] = None
+_CLIENT_INIT = False
+_WORKER: Optional[threading.Thread] = None
+LOG_STATS: Dict[str, int] = {"sent": 0, "dropped": 0, "errors": 0}
+
+
 def _get_client() -> Optional["Opik"]:
-    if Opik is None:
-        return None
-    if not settings.opik_api_key:
-        return None
-    try:
-        return Opik(api_key=settings.opik_api_key)
-    except Exception:
-        return None
+    global _CLIENT, _CLIENT_INIT
+    if not _CLIENT_INIT:
+        with _LOCK:
+            if not _CLIENT_INIT:
+                if Opik is not None and settings.opik_api_key:
+                    try:
+                        _CLIENT = Opik(api_key=settings.opik_api_key)
+                    except Exception:
+                        _CLIENT = None
+                _CLIENT_INIT = True
+    return _CLIENT
 
 
-def log_credibility_decision(signal: Dict[str, Any], extracted: Dict[str, Any], corroborations: List[Dict[str, Any]], score: float, decision: str):
-    client = _get_client()
-    if not client:
-        return
-    try:
-        with client.trace(name="CredibilityAgent") as t:
-            t.log_input(signal)
-            t.log_metadata({"extracted": extracted, "corroborations": corroborations})
-            t.log_output({"score": score, "decision": decision})
-    except Exception:
-        pass
+def _emit(client: "Opik", item: _TraceItem) -> None:
+    name, inp, metadata, output = item
+    with client.trace(name=name) as t:
+        if inp is not None:
+            t.log_input(inp)
+        if callable(metadata):
+            metadata = metadata()
+        if metadata is not None:
+            t.log_metadata(metadata)
+        t.log_output(output)
 
 
-def log_route_decision(origin: Tuple[float, float], destination: Tuple[float, float], incidents: List[Dict[str, Any]], chosen_index: int, reason: str, routes: List[Dict[str, Any]]):
-    client = _get_client()
-    if not client:
+def _records(arr: np.ndarray) -> List[Dict[str, Any]]:
+    """Structured array -> list of dicts, with float32 fields rounded to drop representation noise."""
+    cols: Dict[str, List[Any]] = {}
+    for name in arr.dtype.names:
+        col = arr[name]
+        if col.dtype == np.float32:
+            col = np.round(col.astype(np.float64), 6)
+        cols[name] = col.tolist()
+    return [dict(zip(cols, vals)) for vals in zip(*cols.values())]
+
+
+def _next_batch() -> List[_TraceItem]:
+    # Block for the first item, then collect up to _BATCH_SIZE within _BATCH_WAIT_S
+    batch = [_QUEUE.get()]
+    deadline = time.monotonic() + _BATCH_WAIT_S
+    while len(batch) < _BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_QUEUE.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _log_worker(client: "Opik") -> None:
+    while True:
+        batch = _next_batch()
+        for item in batch:
+            try:
+                _emit(client, item)
+                LOG_STATS["sent"] += 1
+            except Exception:
+                LOG_STATS["errors"] += 1
+        # One flush per batch instead of per trace
+        flush = getattr(client, "flush", None)
+        if flush is not None:
+            try:
+                flush()
+            except Exception:
+                LOG_STATS["errors"] += 1
+
+
+def _ensure_worker(client: "Opik") -> None:
+    global _WORKER
+    if _WORKER is not None:
         return
-    try:
-        with client.trace(name="RoutingAgent") as t:
-            t.log_input({"origin": origin, "destination": destination})
-            t.log_metadata({"incidents": incidents})
-            t.log_output({"chosen_index": chosen_index, "reason": reason, "routes": routes})
-    except Exception:
-        pass
+    with _LOCK:
+        if _WORKER is None:
+            _WORKER = threading.Thread(target=_log_worker, args=(client,), name="opik-log-worker", daemon=True)
+            _WORKER.start()
 
 
-def log_prompt_experiment(version: str, real_sources: List[str], real_result: Dict[str, Any], fake_sources: List[str], fake_result: Dict[str, Any], metrics: Dict[str, Any], prompt_text: str | None = None) -> bool:
+def _enqueue(item: _TraceItem) -> bool:
     client = _get_client()
     if not client:
         return False
+    _ensure_worker(client)
     try:
-        with client.trace(name="CredibilityPromptExperiment") as t:
-            t.log_input({
-                "version": version,
-                "real_sources": real_sources,
-                "fake_sources": fake_sources,
-            })
-            t.log_metadata({
-                "metrics": metrics,
-                "prompt_text": prompt_text,
-            })
-            t.log_output({
-                "real_result": real_result,
-                "fake_result": fake_result,
-            })
-        return True
-    except Exception:
+        _QUEUE.put_nowait(item)
+    except queue.Full:
+        # Never block a request on logging; drop and count instead
+        LOG_STATS["dropped"] += 1
         return False
+    return True
+
+
+def log_credibility_decision(signal: Dict[str, Any], extracted: Dict[str, Any], corroborations: List[Dict[str, Any]], score: float, decision: str):
+    _enqueue((
+        "CredibilityAgent",
+        signal,
+        {"extracted": extracted, "corroborations": corroborations},
+        {"score": score, "decision": decision},
+    ))
+
+
+def log_route_decision(origin: Tuple[float, float], destination: Tuple[float, float], incidents: np.ndarray, chosen_index: int, reason: str, routes: List[Dict[str, Any]]):
+    # incidents is routing's structured array; it is turned into dicts in the worker, not per request
+    _enqueue((
+        "RoutingAgent",
+        {"origin": origin, "destination": destination},
+        lambda: {"incidents": _records(incidents)},
+        {"chosen_index": chosen_index, "reason": reason, "routes": routes},
+    ))
+
+
+def log_prompt_experiment(version: str, real_sources: List[str], real_result: Dict[str, Any], fake_sources: List[str], fake_result: Dict[str, Any], metrics: Dict[str, Any], prompt_text: str | None = None) -> bool:
+    # True once the trace is queued; delivery happens in the background
+    return _enqueue((
+        "CredibilityPromptExperiment",
+        {
+            "version": version,
+            "real_sources": real_sources,
+            "fake_sources": fake_sources,
+        },
+        {
+            "metrics": metrics,
+            "prompt_text": prompt_text,
+        },
+        {
+            "real_result": real_result,
+            "fake_result": fake_result,
+        },
+    ))
 
 
 def log_best_prompt(best_version: str, metrics: Dict[str, Any]) -> bool:
-    client = _get_client()
-    if not client:
-        return False
-    try:
-        with client.trace(name="CredibilityPromptSelection") as t:
-            t.log_input({"candidate": best_version})
-            t.log_output({"selection": best_version, "metrics": metrics})
-        return True
-    except Exception:
-        return False
\ No newline at end of file
+    return _enqueue((
+        "CredibilityPromptSelection",
+        {"candidate": best_version},
+        None,
+        {"selection": best_version, "metrics": metrics},
+    ))
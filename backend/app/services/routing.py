@@ -1,19 +1,24 @@
+from collections import defaultdict
 from typing import List, Tuple, Dict, Any
-import httpx
 import math
 
+import numpy as np
+import orjson
+
 from app.config import settings
+from app.services.cache import cached_json
+from app.services.geo import M_PER_DEG
+from app.services.http_clients import get_client, with_retries
 from app.services.opik_logging import log_route_decision
 
+try:
+    from app.services._penalty_nb import penalty_kernel as _penalty_kernel
+except Exception:
+    _penalty_kernel = None
+
 
-def haversine_m(lat1, lon1, lat2, lon2):
-    R = 6371_000
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+# Structure-of-arrays layout for active incidents passed to the route scorer
+INCIDENT_DTYPE = np.dtype([("lat", "f8"), ("lon", "f8"), ("severity", "f4"), ("credibility", "f4")])
 
 
 async def osrm_routes(origin: Tuple[float, float], destination: Tuple[float, float], alternatives: bool = True) -> List[Dict[str, Any]]:
@@ -24,32 +29,123 @@ async def osrm_routes(origin: Tuple[float, float], destination: Tuple[float, flo
         f"{settings.osrm_base_url}/route/v1/driving/{o_lon},{o_lat};{d_lon},{d_lat}"
         f"?alternatives={'true' if alternatives else 'false'}&overview=full&geometries=geojson"
     )
-    async with httpx.AsyncClient(timeout=10) as client:
-        resp = await client.get(url)
+
+    async def fetch() -> List[Dict[str, Any]]:
+        resp = await get_client().get(url, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         return data.get("routes", [])
 
+    # ~11 m quantization: nearby origins/destinations share cached routes
+    key = f"osrm:{o_lat:.4f}:{o_lon:.4f}:{d_lat:.4f}:{d_lon:.4f}:{int(alternatives)}"
+    return await cached_json(key, 3600, lambda: with_retries(fetch))
+
+
+def _approx_dist2(lat1, lon1, lat2, lon2, cos_lat0):
+    """Squared equirectangular distance in m^2 (broadcasts over arrays).
+
+    Accurate to well under a meter at danger-radius scale, without any trig per pair.
+    """
+    dy = (lat2 - lat1) * M_PER_DEG
+    dx = (lon2 - lon1) * (M_PER_DEG * cos_lat0)
+    return dx * dx + dy * dy
+
+
+def _to_local(latlon: np.ndarray, ref: np.ndarray) -> np.ndarray:
+    # float32 offsets from ref; near the reference they keep millimetre precision
+    # where absolute float32 degrees would round to ~0.5 m
+    return (np.asarray(latlon, dtype=np.float64).reshape(-1, 2) - ref).astype(np.float32)
+
+
+def _incident_arrays(incidents: np.ndarray, ref: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # (M, 2) float32 lat/lon offsets and per-incident penalty weight, built once per request
+    latlon = _to_local(np.column_stack((incidents["lat"], incidents["lon"])), ref)
+    weight = incidents["credibility"].astype(np.float64) * incidents["severity"]  # simple additive penalty
+    return latlon, weight
+
+
+def _grid_cell_size(inc_latlon: np.ndarray, radius_m: float, ref_lat: float = 0.0) -> Tuple[float, float]:
+    # Cells at least one danger radius wide, so a point's 3x3 neighbourhood covers its radius.
+    # Longitude cells widen by 1/cos(lat) at the highest latitude any match could sit at.
+    cell_lat = radius_m / M_PER_DEG
+    max_lat = min(89.0, float(np.abs(inc_latlon[:, 0] + ref_lat).max()) + cell_lat)
+    return cell_lat, cell_lat / math.cos(math.radians(max_lat))
+
+
+def _build_grid(inc_latlon: np.ndarray, cell_lat: float, cell_lon: float) -> Dict[Tuple[int, int], List[int]]:
+    """Bucket incident indices by (lat cell, lon cell)."""
+    ci = np.floor(inc_latlon[:, 0] / cell_lat).astype(np.int64).tolist()
+    cj = np.floor(inc_latlon[:, 1] / cell_lon).astype(np.int64).tolist()
+    grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for idx, key in enumerate(zip(ci, cj)):
+        grid[key].append(idx)
+    return grid
+
+
+def _nearby_incidents(coords: np.ndarray, grid: Dict[Tuple[int, int], List[int]], cell_lat: float, cell_lon: float) -> np.ndarray:
+    """Indices of incidents in the 3x3 cell neighbourhood of any route point."""
+    if len(coords) == 0:
+        return np.empty(0, dtype=np.int64)
+    cells = np.unique(
+        np.column_stack((np.floor(coords[:, 0] / cell_lat), np.floor(coords[:, 1] / cell_lon))).astype(np.int64),
+        axis=0,
+    )
+    found = set()
+    for cx, cy in cells.tolist():
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                found.update(grid.get((cx + di, cy + dj), ()))
+    return np.fromiter(sorted(found), dtype=np.int64, count=len(found))
+
+
+def safety_penalty_for_route(route_coords, inc_latlon: np.ndarray, inc_weight: np.ndarray, ref_lat: float = 0.0) -> float:
+    """Sum of incident weights within the danger radius of each route point.
 
-def safety_penalty_for_route(route_coords: List[Tuple[float, float]], incidents: List[Dict[str, float]]) -> float:
+    route_coords is an (N, 2) lat/lon array (or sequence of pairs). Both it and inc_latlon may be
+    offsets from a reference point at latitude ref_lat, which keeps float32 inputs precise.
+    """
+    if len(route_coords) == 0 or inc_weight.size == 0:
+        return 0.0
     radius = settings.danger_radius_m
-    penalty = 0.0
-    for lat, lon in route_coords:
-        for inc in incidents:
-            dist_m = haversine_m(lat, lon, inc["lat"], inc["lon"])
-            if dist_m <= radius:
-                penalty += (inc["credibility"] * inc["severity"])  # simple additive penalty
-    return penalty
+    coords = np.asarray(route_coords, dtype=np.float32)
+    if _penalty_kernel is not None:
+        # Fused distance + mask + sum in one native pass, no (N, M) temporaries
+        return float(_penalty_kernel(
+            np.ascontiguousarray(coords[:, 0]), np.ascontiguousarray(coords[:, 1]),
+            np.ascontiguousarray(inc_latlon[:, 0]), np.ascontiguousarray(inc_latlon[:, 1]),
+            np.asarray(inc_weight, dtype=np.float64), float(radius), float(ref_lat),
+        ))
+    route_lat = coords[:, 0][:, None]
+    route_lon = coords[:, 1][:, None]
+    # One cosine per route point instead of full haversine per (point, incident) pair
+    cos_lat0 = np.cos(np.radians(route_lat + ref_lat))
+    d2 = _approx_dist2(route_lat, route_lon, inc_latlon[:, 0][None, :], inc_latlon[:, 1][None, :], cos_lat0)
+    mask = d2 <= radius * radius
+    return float((mask * inc_weight[None, :]).sum())
 
 
-async def choose_safest_route(origin: Tuple[float, float], destination: Tuple[float, float], incidents: List[Dict[str, float]]):
+async def choose_safest_route(origin: Tuple[float, float], destination: Tuple[float, float], incidents: np.ndarray):
     routes = await osrm_routes(origin, destination, alternatives=True)
     if not routes:
         return []
+    ref = np.array(origin, dtype=np.float64)
+    ref_lat = float(ref[0])
+    inc_latlon, inc_weight = _incident_arrays(incidents, ref)
+    grid = None
+    if inc_weight.size:
+        cell_lat, cell_lon = _grid_cell_size(inc_latlon, settings.danger_radius_m, ref_lat)
+        grid = _build_grid(inc_latlon, cell_lat, cell_lon)
     scored = []
     for r in routes:
         coords = [(lat, lon) for lon, lat in r["geometry"]["coordinates"]]
-        penalty = safety_penalty_for_route(coords, incidents)
+        if grid is None:
+            penalty = 0.0
+        else:
+            # Contiguous float32 (N, 2) offsets for the numeric passes; coords stays full precision for the response
+            coords_np = _to_local(coords, ref)
+            # Only incidents in cells the route passes near can fall within the radius
+            near = _nearby_incidents(coords_np, grid, cell_lat, cell_lon)
+            penalty = safety_penalty_for_route(coords_np, inc_latlon[near], inc_weight[near], ref_lat)
         scored.append({
             "coordinates": coords,
             "distance_m": r.get("distance", 0.0),
@@ -57,7 +153,9 @@ async def choose_safest_route(origin: Tuple[float, float], destination: Tuple[fl
             "safety_penalty": penalty,
         })
     # Choose route with smallest (distance + penalty * 1000) to strongly prefer safety
-    best_index = min(range(len(scored)), key=lambda i: scored[i]["distance_m"] + scored[i]["safety_penalty"] * 1000)
+    dists = np.fromiter((sc["distance_m"] for sc in scored), dtype=np.float64, count=len(scored))
+    pens = np.fromiter((sc["safety_penalty"] for sc in scored), dtype=np.float64, count=len(scored))
+    best_index = int(np.argmin(dists + pens * 1000.0))
     reason = "Chosen route minimizes distance while avoiding nearby incidents"
     try:
         log_route_decision(origin, destination, incidents, best_index, reason, scored)